@@ -1,11 +1,67 @@
+import os
+
 from fastapi import FastAPI
 
 from apps.geometry.usecase import UseCase as GeometryUseCase
 from apps.geometry.handlers.fastapi.geometry import GeometryHandler
+from domain.geometry.dto import PlaneDTO, PolygonDTO, Precision
+from domain.geometry.errors import ErrInvalidPolygon
+
+
+# Representative cuts run at startup: a valid polygon in both precisions and
+# an invalid one, so that every path of the use case is loaded before the
+# first request.
+WARM_UP_PLANE = {
+    "p1": {"x": 0.5, "y": 0, "z": 0},
+    "p2": {"x": 0.5, "y": 0, "z": 1},
+    "p3": {"x": 0.5, "y": 1, "z": 0},
+}
+WARM_UP_POLYGONS = [
+    {"vertices": [
+        {"x": 0, "y": 0, "z": 0},
+        {"x": 1, "y": 0, "z": 0},
+        {"x": 1, "y": 1, "z": 0},
+        {"x": 0, "y": 1, "z": 0},
+    ]},
+    {"vertices": [
+        {"x": 0, "y": 0, "z": 0},
+        {"x": 0, "y": 1, "z": 0},
+        {"x": 0.1, "y": 0.1, "z": 0},
+        {"x": 1, "y": 0, "z": 0},
+    ]},
+]
+
+
+async def warm_up(geometry_usecase: GeometryUseCase):
+    plane = PlaneDTO.parse_obj(WARM_UP_PLANE)
+    for polygon in WARM_UP_POLYGONS:
+        polygon = PolygonDTO.parse_obj(polygon)
+        for precision in Precision:
+            try:
+                await geometry_usecase.cut_polygon_at_plane(
+                    polygon, plane, precision)
+            except ErrInvalidPolygon:
+                pass
+
+
+def create_app() -> FastAPI:
+    app = FastAPI()
+
+    geometry_usecase = GeometryUseCase(
+        workers=int(os.getenv("GEOMETRY_WORKERS", "1")),
+    )
+    geometry_handler = GeometryHandler(geometry_usecase)
+    geometry_handler.register(app)
 
+    # Startup handlers complete before the server starts accepting
+    # connections, so the worker is warm by the time it reports ready.
+    if os.getenv("GEOMETRY_WARM_UP", "1") != "0":
+        @app.on_event("startup")
+        async def warm_up_geometry():
+            await warm_up(geometry_usecase)
 
-app = FastAPI()
+    @app.on_event("shutdown")
+    def close_geometry():
+        geometry_usecase.close()
 
-geometry_usecase = GeometryUseCase()
-geometry_handler = GeometryHandler(geometry_usecase)
-geometry_handler.register(app)
+    return app
@@ -0,0 +1,55 @@
+from fastapi.testclient import TestClient
+import unittest
+from unittest import mock
+
+from api.fastapi import main
+
+
+class TestCreateApp(unittest.TestCase):
+
+    def test_create_app_warms_up_on_startup(self):
+        app = main.create_app()
+
+        with mock.patch.object(main, "warm_up") as warm_up:
+            with TestClient(app) as client:
+                warm_up.assert_awaited_once()
+
+                response = client.post(
+                    "/geometry/cut",
+                    json={
+                        "polygon": main.WARM_UP_POLYGONS[0],
+                        "plane": main.WARM_UP_PLANE,
+                    }
+                )
+                assert response.status_code == 200
+
+    def test_create_app_closes_usecase_on_shutdown(self):
+        with mock.patch.object(main.GeometryUseCase, "close") as close:
+            app = main.create_app()
+            with TestClient(app):
+                close.assert_not_called()
+            close.assert_called_once()
+
+    def test_create_app_without_warm_up(self):
+        with mock.patch.dict("os.environ", {"GEOMETRY_WARM_UP": "0"}):
+            app = main.create_app()
+
+        with mock.patch.object(main, "warm_up") as warm_up:
+            with TestClient(app):
+                warm_up.assert_not_called()
+
+
+class TestWarmUp(unittest.IsolatedAsyncioTestCase):
+
+    async def test_warm_up(self):
+        usecase = main.GeometryUseCase()
+
+        with mock.patch.object(
+            usecase,
+            "cut_polygon_at_plane",
+            wraps=usecase.cut_polygon_at_plane,
+        ) as cut_polygon_at_plane:
+            await main.warm_up(usecase)
+
+        assert cut_polygon_at_plane.await_count == \
+            len(main.WARM_UP_POLYGONS) * len(main.Precision)
@@ -2,7 +2,7 @@ from typing import List
 from fastapi import APIRouter, FastAPI
 from fastapi.responses import JSONResponse
 
-from domain.geometry.dto import PlaneDTO, PointDTO, PolygonDTO
+from domain.geometry.dto import PlaneDTO, PointDTO, PolygonDTO, Precision
 from domain.geometry.errors import ErrInvalidPolygon
 from domain.geometry.usecase import UseCase as GeometryUseCase
 
@@ -25,9 +25,10 @@ class GeometryHandler:
         self,
         polygon: PolygonDTO,
         plane: PlaneDTO,
+        precision: Precision = Precision.FLOAT64,
     ) -> List[PointDTO]:
         return await self._geometry_usecase\
-            .cut_polygon_at_plane(polygon, plane)
+            .cut_polygon_at_plane(polygon, plane, precision)
 
     async def _handle_invalid_polygon(self, request, exc):
         if isinstance(exc, ErrInvalidPolygon):
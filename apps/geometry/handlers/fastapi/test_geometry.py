@@ -100,6 +100,58 @@ class TestGeometryHandler(unittest.IsolatedAsyncioTestCase):
             {"x": 0, "y": 0, "z": 0}
         ]
 
+    def test_cut_polygon_at_plane_float32(self):
+        payload = {
+            "polygon": self._normal_payload["polygon"],
+            "plane": {
+                "p1": {"x": 0.1, "y": 0, "z": 0},
+                "p2": {"x": 0.1, "y": 0, "z": 1},
+                "p3": {"x": 0.1, "y": 1, "z": 0}
+            }
+        }
+        response = self.client.post(
+            "/geometry/cut?precision=float32",
+            json=payload
+        )
+        assert response.status_code == 200
+        first, second = response.json()
+        assert first == {"x": 0.1, "y": 0, "z": 0}
+        assert abs(second["x"] - 0.1) < 1e-7
+        assert second["y"] == 0.9
+
+    def test_cut_polygon_at_plane_float32_fails_on_overflow(self):
+        payload = {
+            "polygon": {
+                "vertices": [
+                    {"x": 0, "y": 0, "z": 0},
+                    {"x": 1e39, "y": 0, "z": 0},
+                    {"x": 1e39, "y": 1e39, "z": 0},
+                    {"x": 0, "y": 1e39, "z": 0},
+                ]
+            },
+            "plane": {
+                "p1": {"x": 1e38, "y": 0, "z": 0},
+                "p2": {"x": 1e38, "y": 0, "z": 1},
+                "p3": {"x": 1e38, "y": 1, "z": 0}
+            }
+        }
+        response = self.client.post(
+            "/geometry/cut?precision=float32",
+            json=payload
+        )
+
+        assert response.status_code == 400
+        assert response.json()["message"] == "Invalid polygon"
+        assert response.json()["details"] == \
+            str(errors.ErrPolygonNotRepresentable())
+
+    def test_cut_polygon_at_plane_fails_on_unknown_precision(self):
+        response = self.client.post(
+            "/geometry/cut?precision=float16",
+            json=self._normal_payload
+        )
+        assert response.status_code == 422
+
     def test_cut_polygon_at_plane_fails_on_polygon_not_on_xy_plane(self):
         response = self.client.post(
             "/geometry/cut",
@@ -0,0 +1,177 @@
+import math
+import struct
+from typing import List, Optional, Sequence, Tuple
+
+from domain.geometry import entity
+
+
+Coordinates = Tuple[float, float, float]
+
+# numpy is optional and only imported on first use, so that it does not slow
+# down the start of workers that never need it.
+np = None
+_available: Optional[bool] = None
+
+
+def is_available() -> bool:
+    global np, _available
+    if _available is None:
+        try:
+            import numpy
+        except ImportError:  # pragma: no cover
+            numpy = None
+        np = numpy
+        _available = numpy is not None
+    return _available
+
+
+def to_float32(value: float) -> float:
+    # Rounds the value to the nearest float32 and returns the shortest
+    # decimal representation that rounds back to it, so that the JSON
+    # output does not carry meaningless digits.
+    try:
+        value = struct.unpack("f", struct.pack("f", value))[0]
+    except OverflowError:
+        return math.copysign(math.inf, value)
+    for digits in range(6, 9):
+        shortened = float("%.*g" % (digits, value))
+        if struct.unpack("f", struct.pack("f", shortened))[0] == value:
+            return shortened
+    return float("%.9g" % value)
+
+
+def fits_float32(value: float) -> bool:
+    # Whether the value is finite in float32.
+    try:
+        rounded = struct.unpack("f", struct.pack("f", value))[0]
+    except OverflowError:
+        return False
+    return math.isfinite(rounded)
+
+
+def to_arrays(
+    vertices: Sequence[entity.Point],
+    padding: int = 2,
+    dtype: str = "float64",
+):
+    # Store the ring as three coordinate arrays. The first `padding`
+    # vertices are appended at the end, so that every wrap-around triple
+    # (or edge) is a plain contiguous slice. Values out of the range of
+    # `dtype` become infinite, see `is_representable`.
+    count = len(vertices)
+    xs = np.empty(count + padding, dtype=dtype)
+    ys = np.empty(count + padding, dtype=dtype)
+    zs = np.empty(count + padding, dtype=dtype)
+    with np.errstate(over="ignore"):
+        xs[:count] = [vertex.x for vertex in vertices]
+        ys[:count] = [vertex.y for vertex in vertices]
+        zs[:count] = [vertex.z for vertex in vertices]
+    for array in (xs, ys, zs):
+        array[count:] = array[:padding]
+    return xs, ys, zs
+
+
+def is_representable(
+    arrays: Sequence,
+    vertices: Sequence[entity.Point],
+) -> bool:
+    # Whether no coordinate overflowed when the arrays were built from the
+    # vertices, and no nonzero z was flushed to zero, which would move the
+    # polygon onto the XY plane.
+    if not all(np.all(np.isfinite(array)) for array in arrays):
+        return False
+    nonzero = sum(1 for vertex in vertices if vertex.z != 0)
+    return np.count_nonzero(arrays[2][:len(vertices)]) == nonzero
+
+
+def chunk_bounds(count: int, chunk_size: int) -> List[Tuple[int, int]]:
+    return [
+        (start, min(start + chunk_size, count))
+        for start in range(0, count, chunk_size)
+    ]
+
+
+def validate_chunk(start: int, stop: int, xs, ys, zs) -> Tuple[bool, bool]:
+    # Returns whether the vertices of the chunk lie on the XY plane and
+    # whether the z component of the cross product changes its sign between
+    # two consecutive triples within the chunk.
+    on_xy_plane = not np.any(zs[start:stop] != 0)
+
+    # The chunk overlaps with the previous one by a single triple, so that
+    # the sign comparison across the chunk border is not lost.
+    lo = max(start - 1, 0)
+    p1x, p1y = xs[lo:stop], ys[lo:stop]
+    p2x, p2y = xs[lo + 1:stop + 1], ys[lo + 1:stop + 1]
+    p3x, p3y = xs[lo + 2:stop + 2], ys[lo + 2:stop + 2]
+
+    # Same operations as `Vector.cross` on `p2 - p1` and `p2 - p3`, so the
+    # results are bitwise equal to the serial path. Overflows give infinite
+    # or NaN products, which are compared as in the serial path too.
+    with np.errstate(over="ignore", invalid="ignore"):
+        v1x, v1y = p2x - p1x, p2y - p1y
+        v2x, v2y = p2x - p3x, p2y - p3y
+        cross_z = v1x * v2y - v1y * v2x
+        sign_changes = bool(np.any(cross_z[:-1] * cross_z[1:] < 0))
+
+    return on_xy_plane, sign_changes
+
+
+def validate_vertices_chunk(
+    start: int,
+    stop: int,
+    vertices: Sequence[entity.Point],
+) -> Tuple[bool, bool]:
+    # Same as `validate_chunk`, on float64 arrays built from the vertices for
+    # this chunk only. This validates a polygon stored in reduced precision
+    # exactly as the float64 path does, without a float64 copy of the ring.
+    count = len(vertices)
+    lo = max(start - 1, 0)
+    ring = [vertices[i % count] for i in range(lo, stop + 2)]
+    xs = np.array([vertex.x for vertex in ring])
+    ys = np.array([vertex.y for vertex in ring])
+    zs = np.array([vertex.z for vertex in ring])
+    return validate_chunk(start - lo, stop - lo, xs, ys, zs)
+
+
+def intersect_chunk(
+    start: int,
+    stop: int,
+    xs,
+    ys,
+    zs,
+    plane_normal: Coordinates,
+    plane_point: Coordinates,
+) -> Tuple[List[Coordinates], bool]:
+    # Returns the intersection points of the edges [start, stop) with the
+    # plane, in edge order and possibly with duplicates, and whether all the
+    # intermediate results are finite. The computation is done in the
+    # precision of the coordinate arrays.
+    with np.errstate(over="ignore", divide="ignore", invalid="ignore"):
+        nx, ny, nz = (xs.dtype.type(value) for value in plane_normal)
+        px, py, pz = (xs.dtype.type(value) for value in plane_point)
+
+        x, y, z = xs[start:stop], ys[start:stop], zs[start:stop]
+        ex = xs[start + 1:stop + 1] - x
+        ey = ys[start + 1:stop + 1] - y
+        ez = zs[start + 1:stop + 1] - z
+
+        dot_product = nx * ex + ny * ey + nz * ez
+        numerator = (px - x) * nx + (py - y) * ny + (pz - z) * nz
+        t = numerator / dot_product
+
+    finite = bool(
+        np.all(np.isfinite(dot_product)) and np.all(np.isfinite(numerator)))
+
+    # `~(t < 0) & ~(t > 1)` rather than `(0 <= t) & (t <= 1)` keeps the
+    # serial behaviour for NaN values.
+    mask = (dot_product != 0) & ~(t < 0) & ~(t > 1)
+    indices = np.flatnonzero(mask)
+    t = t[indices]
+
+    with np.errstate(over="ignore", invalid="ignore"):
+        points = list(zip(
+            (x[indices] + ex[indices] * t).tolist(),
+            (y[indices] + ey[indices] * t).tolist(),
+            (z[indices] + ez[indices] * t).tolist(),
+        ))
+    return points, finite
@@ -1,11 +1,18 @@
+import math
 import unittest
+import warnings
+from unittest import mock
 
+from apps.geometry import kernels
 from apps.geometry.usecase import UseCase as GeometryUseCase
-from domain.geometry.dto import PlaneDTO, PointDTO, PolygonDTO
+from benchmarks import polygons
+from domain.geometry.dto import PlaneDTO, PointDTO, PolygonDTO, Precision
 from domain.geometry.entity import Plane, Polygon, Point
 from domain.geometry.errors import (
+    ErrInvalidPolygon,
     ErrPolygonNotConvex,
     ErrPolygonNotOnXYPlane,
+    ErrPolygonNotRepresentable,
     ErrPlaneNotOrthogonalToPolygon,
     ErrPlaneDoesNotIntersectPolygon
 )
@@ -251,3 +258,298 @@ class TestGeometryUsecase(unittest.IsolatedAsyncioTestCase):
         result = await usecase.cut_polygon_at_plane(polygon, plane)
         self.assertEqual(len(result), 1)
         self.assertEqual(result[0], Point(x=0, y=0, z=0))
+
+
+@unittest.skipUnless(kernels.is_available(), "numpy is not installed")
+class TestGeometryUsecaseParallel(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self) -> None:
+        self.serial = GeometryUseCase()
+        self.parallel = GeometryUseCase(workers=4, chunk_size=7)
+
+    def tearDown(self) -> None:
+        self.parallel.close()
+
+    async def _assert_same_result(self, polygon, plane):
+        try:
+            expected = await self.serial.cut_polygon_at_plane(polygon, plane)
+        except ErrInvalidPolygon as exc:
+            with self.assertRaises(type(exc)):
+                await self.parallel.cut_polygon_at_plane(polygon, plane)
+        else:
+            result = await self.parallel.cut_polygon_at_plane(polygon, plane)
+            self.assertEqual(result, expected)
+
+    async def test_cut_polygon_at_plane_matches_serial(self):
+        polygon = polygons.regular_polygon(100)
+
+        for angle in range(0, 360, 7):
+            plane = PlaneDTO(
+                p1=PointDTO(x=0.1, y=0.2, z=0),
+                p2=PointDTO(x=0.1, y=0.2, z=1),
+                p3=PointDTO(
+                    x=0.1 + math.cos(math.radians(angle)),
+                    y=0.2 + math.sin(math.radians(angle)),
+                    z=0,
+                ),
+            )
+            await self._assert_same_result(polygon, plane)
+
+    async def test_cut_polygon_at_plane_through_vertices_matches_serial(self):
+        polygon = polygons.regular_polygon(64)
+
+        # The plane crosses the polygon through two opposite vertices, which
+        # are found on both adjacent edges and must be deduplicated.
+        plane = PlaneDTO(
+            p1=PointDTO(x=-1, y=0, z=0),
+            p2=PointDTO(x=-1, y=0, z=1),
+            p3=PointDTO(x=1, y=0, z=0),
+        )
+        await self._assert_same_result(polygon, plane)
+
+    async def test_close_shuts_down_the_thread_pool(self):
+        polygon = polygons.regular_polygon(20)
+        plane = PlaneDTO(
+            p1=PointDTO(x=0, y=0, z=0),
+            p2=PointDTO(x=0, y=0, z=1),
+            p3=PointDTO(x=1, y=0, z=0),
+        )
+        await self.parallel.cut_polygon_at_plane(polygon, plane)
+        executor = self.parallel._executor
+        self.assertIsNotNone(executor)
+
+        self.parallel.close()
+        self.assertIsNone(self.parallel._executor)
+        with self.assertRaises(RuntimeError):
+            executor.submit(print)
+
+        # The pool is created again on the next parallel cut
+        await self.parallel.cut_polygon_at_plane(polygon, plane)
+        self.assertIsNotNone(self.parallel._executor)
+
+    async def test_cut_polygon_at_plane_fails_as_serial(self):
+        plane = PlaneDTO(
+            p1=PointDTO(x=0, y=0, z=0),
+            p2=PointDTO(x=0, y=0, z=1),
+            p3=PointDTO(x=1, y=0, z=0),
+        )
+
+        # Not on the XY plane
+        polygon = polygons.regular_polygon(50)
+        polygon.vertices[33].z = 1
+        await self._assert_same_result(polygon, plane)
+
+        # Not convex, with the concave vertex at a chunk border and at the
+        # wrap-around of the ring
+        for index in (6, 7, 8, 0, 49):
+            polygon = polygons.regular_polygon(50)
+            polygon.vertices[index].x *= 0.5
+            polygon.vertices[index].y *= 0.5
+            await self._assert_same_result(polygon, plane)
+
+        # Not orthogonal
+        await self._assert_same_result(
+            polygons.regular_polygon(50),
+            PlaneDTO(
+                p1=PointDTO(x=0, y=0, z=0),
+                p2=PointDTO(x=0, y=1, z=0),
+                p3=PointDTO(x=1, y=0, z=0),
+            ),
+        )
+
+        # No intersection
+        await self._assert_same_result(
+            polygons.regular_polygon(50),
+            PlaneDTO(
+                p1=PointDTO(x=5, y=0, z=0),
+                p2=PointDTO(x=5, y=0, z=1),
+                p3=PointDTO(x=5, y=1, z=0),
+            ),
+        )
+
+
+class TestGeometryUsecasePrecision(unittest.IsolatedAsyncioTestCase):
+
+    # 32 units in the last place of float32, relative to the scale of the
+    # polygon coordinates.
+    FLOAT32_ERROR_BOUND = 32 * 2 ** -24
+
+    async def test_cut_polygon_at_plane_float32_error_bound(self):
+        usecase = GeometryUseCase()
+
+        for name, generator in polygons.GENERATORS.items():
+            for count in (3, 10, 100, 1000, 10000):
+                for radius, center in (
+                    (1, (0, 0)),
+                    (1e-3, (0, 0)),
+                    (1e6, (0, 0)),
+                    (1e3, (5e3, -3e3)),
+                ):
+                    polygon = generator(count, radius, center)
+                    scale = radius + max(abs(center[0]), abs(center[1]))
+                    planes = polygons.random_cutting_planes(
+                        polygon, 20 if count <= 100 else 1)
+
+                    for plane in planes:
+                        await self._assert_float32_error_bound(
+                            usecase, polygon, plane, scale, (name, count))
+
+    async def _assert_float32_error_bound(
+        self,
+        usecase,
+        polygon,
+        plane,
+        scale,
+        msg,
+    ):
+        # Every cut accepted in float64 is accepted in float32 too
+        try:
+            expected = await usecase.cut_polygon_at_plane(polygon, plane)
+        except ErrInvalidPolygon as exc:
+            with self.assertRaises(type(exc), msg=msg):
+                await usecase.cut_polygon_at_plane(
+                    polygon, plane, Precision.FLOAT32)
+            return
+        result = await usecase.cut_polygon_at_plane(
+            polygon, plane, Precision.FLOAT32)
+
+        self.assertEqual(len(result), len(expected), msg)
+        for point, expected_point in zip(result, expected):
+            for axis in "xyz":
+                error = abs(
+                    getattr(point, axis) - getattr(expected_point, axis))
+                self.assertLessEqual(
+                    error / scale, self.FLOAT32_ERROR_BOUND, msg)
+
+    async def test_cut_polygon_at_plane_float32_output_is_shortened(self):
+        usecase = GeometryUseCase()
+
+        polygon = PolygonDTO(
+            vertices=[
+                PointDTO(x=0, y=0, z=0),
+                PointDTO(x=0, y=1, z=0),
+                PointDTO(x=1, y=1, z=0),
+            ]
+        )
+
+        plane = PlaneDTO(
+            p1=PointDTO(x=1 / 3, y=0, z=0),
+            p2=PointDTO(x=1 / 3, y=0, z=1),
+            p3=PointDTO(x=1 / 3, y=1, z=0),
+        )
+
+        result = await usecase.cut_polygon_at_plane(
+            polygon, plane, Precision.FLOAT32)
+        self.assertEqual(len(result), 2)
+        self.assertAlmostEqual(result[0].x, 1 / 3, places=6)
+        self.assertAlmostEqual(result[1].y, 1 / 3, places=6)
+
+        # No more digits than needed to identify a float32
+        for point in result:
+            for value in (point.x, point.y, point.z):
+                self.assertEqual(value, float("%.8g" % value))
+
+    async def _assert_not_representable(self, polygon, plane, fallback=True):
+        usecase = GeometryUseCase()
+
+        # Without warnings from the array kernels either
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            with self.assertRaises(ErrPolygonNotRepresentable):
+                await usecase.cut_polygon_at_plane(
+                    polygon, plane, Precision.FLOAT32)
+
+        if not fallback:
+            return
+        with mock.patch.object(kernels, "is_available", return_value=False):
+            with self.assertRaises(ErrPolygonNotRepresentable):
+                await usecase.cut_polygon_at_plane(
+                    polygon, plane, Precision.FLOAT32)
+
+    async def test_cut_polygon_at_plane_float32_fails_on_overflow(self):
+        plane = PlaneDTO(
+            p1=PointDTO(x=0.1, y=0, z=0),
+            p2=PointDTO(x=0.1, y=0, z=1),
+            p3=PointDTO(x=0.1, y=1, z=0),
+        )
+
+        # Vertices out of the float32 range
+        await self._assert_not_representable(
+            polygons.regular_polygon(4, radius=1e39), plane)
+
+        # Plane out of the float32 range
+        await self._assert_not_representable(
+            polygons.regular_polygon(4),
+            PlaneDTO(
+                p1=PointDTO(x=0.1, y=0, z=0),
+                p2=PointDTO(x=0.1, y=0, z=1e39),
+                p3=PointDTO(x=0.1, y=1, z=0),
+            ),
+        )
+
+        # Vertices in range, but edges out of it. Without numpy the cut is
+        # computed in float64 and does not overflow.
+        if kernels.is_available():
+            await self._assert_not_representable(
+                PolygonDTO(
+                    vertices=[
+                        PointDTO(x=-3e38, y=-3e38, z=0),
+                        PointDTO(x=3e38, y=-3e38, z=0),
+                        PointDTO(x=3e38, y=3e38, z=0),
+                        PointDTO(x=-3e38, y=3e38, z=0),
+                    ]
+                ),
+                plane,
+                fallback=False,
+            )
+
+    async def test_cut_polygon_at_plane_float32_underflow(self):
+        usecase = GeometryUseCase()
+        plane = PlaneDTO(
+            p1=PointDTO(x=0.1, y=0, z=0),
+            p2=PointDTO(x=0.1, y=0, z=1),
+            p3=PointDTO(x=0.1, y=1, z=0),
+        )
+
+        # A tiny z is not flushed to 0, which would move the polygon onto
+        # the XY plane
+        polygon = polygons.regular_polygon(4)
+        polygon.vertices[1].z = 1e-50
+        for precision in Precision:
+            with self.assertRaises(ErrPolygonNotOnXYPlane):
+                await usecase.cut_polygon_at_plane(polygon, plane, precision)
+        with mock.patch.object(kernels, "is_available", return_value=False):
+            with self.assertRaises(ErrPolygonNotOnXYPlane):
+                await usecase.cut_polygon_at_plane(
+                    polygon, plane, Precision.FLOAT32)
+
+        # A tiny x or y is rounded to 0 well within the error bound
+        polygon = polygons.regular_polygon(4)
+        polygon.vertices[1].x = 1e-50
+        polygon.vertices[2].y = -1e-50
+        expected = await usecase.cut_polygon_at_plane(polygon, plane)
+        result = await usecase.cut_polygon_at_plane(
+            polygon, plane, Precision.FLOAT32)
+        self.assertEqual(len(result), len(expected))
+        with mock.patch.object(kernels, "is_available", return_value=False):
+            result = await usecase.cut_polygon_at_plane(
+                polygon, plane, Precision.FLOAT32)
+        self.assertEqual(len(result), len(expected))
+
+    async def test_cut_polygon_at_plane_float32_runs_small_inline(self):
+        usecase = GeometryUseCase(workers=4, chunk_size=7)
+        plane = PlaneDTO(
+            p1=PointDTO(x=0.1, y=0, z=0),
+            p2=PointDTO(x=0.1, y=0, z=1),
+            p3=PointDTO(x=0.1, y=1, z=0),
+        )
+
+        await usecase.cut_polygon_at_plane(
+            polygons.regular_polygon(5), plane, Precision.FLOAT32)
+        self.assertIsNone(usecase._executor)
+
+        await usecase.cut_polygon_at_plane(
+            polygons.regular_polygon(50), plane, Precision.FLOAT32)
+        if kernels.is_available():
+            self.assertIsNotNone(usecase._executor)
+        usecase.close()
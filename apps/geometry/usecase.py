@@ -1,20 +1,87 @@
-from typing import List
+import asyncio
+import math
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
+from apps.geometry import kernels
 from domain.geometry import entity, errors
-from domain.geometry.dto import PointDTO, PolygonDTO, PlaneDTO
+from domain.geometry.dto import PointDTO, PolygonDTO, PlaneDTO, Precision
 from domain.geometry.usecase import UseCase
 
 
 class UseCase(UseCase):
 
+    def __init__(self, workers: int = 1, chunk_size: int = 262144):
+        # With more than one worker, polygons having more than `chunk_size`
+        # vertices are validated and cut chunk by chunk on a thread pool.
+        # The parallel path requires numpy, whose array operations release
+        # the GIL, and falls back to the serial one otherwise.
+        self._workers = workers
+        self._chunk_size = chunk_size
+        self._executor: Optional[ThreadPoolExecutor] = None
+
     async def cut_polygon_at_plane(
         self,
         polygon: PolygonDTO,
         plane: PlaneDTO,
+        precision: Precision = Precision.FLOAT64,
     ) -> List[PointDTO]:
         polygon = polygon.to_entity()
         plane = plane.to_entity()
 
+        if precision == Precision.FLOAT32:
+            return await self._cut_polygon_at_plane_float32(polygon, plane)
+
+        if self._is_parallel(polygon):
+            return await self._cut_polygon_at_plane_chunked(
+                polygon, plane, parallel=True)
+        return await self._cut_polygon_at_plane(polygon, plane)
+
+    async def _cut_polygon_at_plane_float32(
+        self,
+        polygon: entity.Polygon,
+        plane: entity.Plane,
+    ) -> List[entity.Point]:
+        # The coordinates are stored and computed in float32 when numpy is
+        # available, and only the output is rounded otherwise. Either way,
+        # coordinates that do not survive the rounding are rejected.
+        if not all(
+            kernels.fits_float32(value)
+            for point in (plane.p1, plane.p2, plane.p3)
+            for value in (point.x, point.y, point.z)
+        ):
+            raise errors.ErrPolygonNotRepresentable()
+
+        if kernels.is_available():
+            intersection_points = await self._cut_polygon_at_plane_chunked(
+                polygon, plane,
+                parallel=self._is_parallel(polygon), dtype="float32")
+        else:
+            if not all(
+                kernels.fits_float32(value)
+                for vertex in polygon.vertices
+                for value in (vertex.x, vertex.y, vertex.z)
+            ):
+                raise errors.ErrPolygonNotRepresentable()
+            intersection_points = await self._cut_polygon_at_plane(
+                polygon, plane)
+
+        # The float64 results of the fallback may still overflow in float32
+        intersection_points = self._round_to_float32(intersection_points)
+        if not all(
+            math.isfinite(value)
+            for point in intersection_points
+            for value in (point.x, point.y, point.z)
+        ):
+            raise errors.ErrPolygonNotRepresentable()
+        return intersection_points
+
+    async def _cut_polygon_at_plane(
+        self,
+        polygon: entity.Polygon,
+        plane: entity.Plane,
+    ) -> List[entity.Point]:
+
         # Validate polygon lies on the XY plane
         if not self._is_polygon_on_xy_plane(polygon):
             raise errors.ErrPolygonNotOnXYPlane()
@@ -49,6 +116,125 @@ class UseCase(UseCase):
             raise errors.ErrPlaneDoesNotIntersectPolygon()
         return intersection_points
 
+    def _is_parallel(self, polygon: entity.Polygon) -> bool:
+        return self._workers > 1 \
+            and kernels.is_available() \
+            and len(polygon.vertices) > max(self._chunk_size, 2)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self._workers)
+        return self._executor
+
+    def close(self):
+        # Stops the threads of the pool, if it has been created.
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    async def _run_chunks(
+        self,
+        count: int,
+        parallel: bool,
+        func,
+        *args,
+    ) -> list:
+        # Results are returned in chunk order, regardless of the order the
+        # chunks are completed in. Unless `parallel` is set, the chunks are
+        # run inline, without the cost of handing them over to the pool.
+        bounds = kernels.chunk_bounds(count, self._chunk_size)
+        if not parallel:
+            return [func(start, stop, *args) for start, stop in bounds]
+
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        return await asyncio.gather(*(
+            loop.run_in_executor(executor, func, start, stop, *args)
+            for start, stop in bounds
+        ))
+
+    async def _validate_chunked(
+        self,
+        polygon: entity.Polygon,
+        plane: entity.Plane,
+        parallel: bool,
+        func,
+        *args,
+    ):
+        # The validations are run in the same order as in the serial path,
+        # so that the same error is raised for the same polygon.
+        results = await self._run_chunks(
+            len(polygon.vertices), parallel, func, *args)
+        if not all(on_xy_plane for on_xy_plane, _ in results):
+            raise errors.ErrPolygonNotOnXYPlane()
+        if any(sign_changes for _, sign_changes in results):
+            raise errors.ErrPolygonNotConvex()
+        if not self._is_plane_orthogonal_to_polygon(plane, polygon):
+            raise errors.ErrPlaneNotOrthogonalToPolygon()
+
+    async def _cut_polygon_at_plane_chunked(
+        self,
+        polygon: entity.Polygon,
+        plane: entity.Plane,
+        parallel: bool,
+        dtype: str = "float64",
+    ) -> List[entity.Point]:
+        count = len(polygon.vertices)
+
+        if dtype == "float64":
+            xs, ys, zs = kernels.to_arrays(polygon.vertices)
+            await self._validate_chunked(
+                polygon, plane, parallel, kernels.validate_chunk, xs, ys, zs)
+        else:
+            # In reduced precision, the polygon is validated on its float64
+            # coordinates, so that the rounding does not reject polygons the
+            # float64 path accepts. Only then are the arrays built.
+            await self._validate_chunked(
+                polygon, plane, parallel, kernels.validate_vertices_chunk,
+                polygon.vertices)
+            xs, ys, zs = kernels.to_arrays(polygon.vertices, dtype=dtype)
+            if not kernels.is_representable((xs, ys, zs), polygon.vertices):
+                raise errors.ErrPolygonNotRepresentable()
+
+        v1: entity.Vector = plane.p2 - plane.p1
+        v2: entity.Vector = plane.p3 - plane.p1
+        plane_normal = v1.cross(v2)
+
+        results = await self._run_chunks(
+            count, parallel, kernels.intersect_chunk, xs, ys, zs,
+            (plane_normal.x, plane_normal.y, plane_normal.z),
+            (plane.p1.x, plane.p1.y, plane.p1.z),
+        )
+
+        # Unlike the serial path, reduced precision rejects overflows of the
+        # intermediate results.
+        if dtype != "float64" and not all(finite for _, finite in results):
+            raise errors.ErrPolygonNotRepresentable()
+
+        intersection_points = []
+        for chunk, _ in results:
+            for x, y, z in chunk:
+                intersection_point = entity.Point(x=x, y=y, z=z)
+                if intersection_point not in intersection_points:
+                    intersection_points.append(intersection_point)
+
+        if not intersection_points:
+            raise errors.ErrPlaneDoesNotIntersectPolygon()
+        return intersection_points
+
+    def _round_to_float32(
+        self,
+        points: List[entity.Point],
+    ) -> List[entity.Point]:
+        return [
+            entity.Point(
+                x=kernels.to_float32(point.x),
+                y=kernels.to_float32(point.y),
+                z=kernels.to_float32(point.z),
+            )
+            for point in points
+        ]
+
     def _calculate_intersection_point(
         self,
         p1: entity.Point,
@@ -0,0 +1,123 @@
+"""Measures the import time of the app and the time to first response.
+
+Usage:
+    python -m benchmarks.cold_start [--runs 5] [--port 8765]
+
+Every run starts a fresh uvicorn worker, with and without the startup
+warm-up, and reports the median of the runs as JSON.
+"""
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+from benchmarks import polygons
+
+
+IMPORT_SCRIPT = """
+import time
+start = time.perf_counter()
+from api.fastapi.main import create_app
+imported = time.perf_counter()
+create_app()
+created = time.perf_counter()
+print(imported - start, created - imported)
+"""
+
+
+def measure_import() -> dict:
+    output = subprocess.check_output(
+        [sys.executable, "-c", IMPORT_SCRIPT], text=True)
+    import_time, create_time = map(float, output.split())
+    return {"import_s": import_time, "create_app_s": create_time}
+
+
+def wait_for_port(port: int, timeout: float) -> None:
+    deadline = time.perf_counter() + timeout
+    while time.perf_counter() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                return
+        except OSError:
+            time.sleep(0.005)
+    raise TimeoutError(f"Server did not start on port {port}")
+
+
+def post_cut(port: int, body: bytes) -> float:
+    request = urllib.request.Request(
+        f"http://127.0.0.1:{port}/geometry/cut",
+        data=body,
+        headers={"Content-Type": "application/json"},
+    )
+    start = time.perf_counter()
+    with urllib.request.urlopen(request) as response:
+        response.read()
+    return time.perf_counter() - start
+
+
+def measure_first_response(port: int, warm_up: bool, body: bytes) -> dict:
+    env = dict(os.environ, GEOMETRY_WARM_UP="1" if warm_up else "0")
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "--factory",
+            "api.fastapi.main:create_app", "--port", str(port),
+            "--log-level", "warning",
+        ],
+        env=env,
+    )
+    try:
+        wait_for_port(port, timeout=30)
+        ready = time.perf_counter() - start
+        first = post_cut(port, body)
+        second = post_cut(port, body)
+    finally:
+        server.terminate()
+        server.wait()
+    return {
+        "ready_s": ready,
+        "first_response_s": ready + first,
+        "first_request_s": first,
+        "second_request_s": second,
+    }
+
+
+def median(results: list) -> dict:
+    return {
+        key: statistics.median(result[key] for result in results)
+        for key in results[0]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    polygon = polygons.regular_polygon(100)
+    plane = next(polygons.random_cutting_planes(polygon, 1))
+    body = json.dumps({
+        "polygon": polygon.dict(),
+        "plane": plane.dict(),
+    }).encode()
+
+    report = {
+        "runs": args.runs,
+        "import": median([measure_import() for _ in range(args.runs)]),
+    }
+    for warm_up in (False, True):
+        report["warm_up" if warm_up else "no_warm_up"] = median([
+            measure_first_response(args.port, warm_up, body)
+            for _ in range(args.runs)
+        ])
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
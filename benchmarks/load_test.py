@@ -0,0 +1,270 @@
+"""Measures the throughput and latency of a single worker under load.
+
+Usage:
+    python -m benchmarks.load_test [--sizes 3 100 1000] [--weights 5 3 1]
+        [--invalid-ratio 0.2] [--concurrency 1 4 16] [--duration 10]
+        [--output report.json]
+
+Starts the app with uvicorn on localhost and drives /geometry/cut with a mix
+of polygon sizes and of valid and invalid inputs, for each concurrency level
+in turn. The report is printed (or written) as JSON.
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from benchmarks import polygons
+from benchmarks.cold_start import wait_for_port
+from domain.geometry.dto import PlaneDTO, PointDTO, PolygonDTO
+
+
+# Every payload is a (kind, body) pair. Valid payloads are expected to be
+# answered with 200 and invalid ones with 400.
+Payload = Tuple[str, bytes]
+
+INVALID_KINDS = [
+    "not_on_xy_plane",
+    "not_convex",
+    "not_orthogonal",
+    "no_intersection",
+]
+
+
+def encode(polygon: PolygonDTO, plane: PlaneDTO) -> bytes:
+    return json.dumps({
+        "polygon": polygon.dict(),
+        "plane": plane.dict(),
+    }).encode()
+
+
+def valid_payloads(size: int, count: int) -> List[Payload]:
+    polygon = polygons.random_convex_polygon(size, seed=size)
+    return [
+        ("valid", encode(polygon, plane))
+        for plane in polygons.random_cutting_planes(polygon, count)
+    ]
+
+
+def concave_polygon(size: int) -> PolygonDTO:
+    # A regular polygon with one vertex reflected past the chord between its
+    # neighbours, which is concave for any size. Triangles cannot be
+    # concave, so at least 4 vertices are used.
+    polygon = polygons.regular_polygon(max(size, 4))
+    previous, vertex, following = polygon.vertices[-1:] + polygon.vertices[:2]
+    mx = (previous.x + following.x) / 2
+    my = (previous.y + following.y) / 2
+    vertex.x = mx - (vertex.x - mx) / 2
+    vertex.y = my - (vertex.y - my) / 2
+    return polygon
+
+
+def invalid_payloads(size: int) -> List[Payload]:
+    polygon = polygons.regular_polygon(size)
+    plane = next(polygons.random_cutting_planes(polygon, 1))
+
+    not_on_xy_plane = polygons.regular_polygon(size)
+    not_on_xy_plane.vertices[-1].z = 1
+
+    not_convex = concave_polygon(size)
+
+    xy_plane = PlaneDTO(
+        p1=PointDTO(x=0, y=0, z=0),
+        p2=PointDTO(x=1, y=0, z=0),
+        p3=PointDTO(x=0, y=1, z=0),
+    )
+    far_plane = PlaneDTO(
+        p1=PointDTO(x=2, y=0, z=0),
+        p2=PointDTO(x=2, y=0, z=1),
+        p3=PointDTO(x=2, y=1, z=0),
+    )
+    return [
+        ("not_on_xy_plane", encode(not_on_xy_plane, plane)),
+        ("not_convex", encode(not_convex, plane)),
+        ("not_orthogonal", encode(polygon, xy_plane)),
+        ("no_intersection", encode(polygon, far_plane)),
+    ]
+
+
+def percentile(values: List[float], q: float) -> Optional[float]:
+    # Nearest-rank percentile of sorted values.
+    if not values:
+        return None
+    rank = max(math.ceil(q / 100 * len(values)), 1)
+    return values[rank - 1]
+
+
+def latency_summary(latencies: List[float]) -> Dict[str, Optional[float]]:
+    latencies = sorted(latency * 1000 for latency in latencies)
+    return {
+        "p50": percentile(latencies, 50),
+        "p95": percentile(latencies, 95),
+        "p99": percentile(latencies, 99),
+        "mean": sum(latencies) / len(latencies) if latencies else None,
+        "max": latencies[-1] if latencies else None,
+    }
+
+
+class Worker(threading.Thread):
+    # Sends requests one after another over a single keep-alive connection
+    # until the deadline, and records (kind, status, latency) samples. The
+    # status is None when the request failed without a response.
+
+    def __init__(self, port, payloads, weights, deadline, seed):
+        super().__init__(daemon=True)
+        self._port = port
+        self._payloads = payloads
+        self._weights = weights
+        self._deadline = deadline
+        self._rng = random.Random(seed)
+        self.samples: List[Tuple[str, Optional[int], float]] = []
+
+    def run(self):
+        connection = http.client.HTTPConnection("127.0.0.1", self._port)
+        while time.perf_counter() < self._deadline:
+            kind, body = self._rng.choices(
+                self._payloads, weights=self._weights)[0]
+            start = time.perf_counter()
+            try:
+                connection.request(
+                    "POST", "/geometry/cut", body,
+                    {"Content-Type": "application/json"},
+                )
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(
+                    "127.0.0.1", self._port)
+                status = None
+            self.samples.append((kind, status, time.perf_counter() - start))
+        connection.close()
+
+
+def run_level(port, payloads, weights, concurrency, duration) -> dict:
+    deadline = time.perf_counter() + duration
+    workers = [
+        Worker(port, payloads, weights, deadline, seed)
+        for seed in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    elapsed = time.perf_counter() - start
+
+    samples = [sample for worker in workers for sample in worker.samples]
+    statuses: Dict[str, int] = {}
+    unexpected = 0
+    for kind, status, _ in samples:
+        key = str(status) if status is not None else "connection_error"
+        statuses[key] = statuses.get(key, 0) + 1
+        if status != (200 if kind == "valid" else 400):
+            unexpected += 1
+
+    return {
+        "concurrency": concurrency,
+        "duration_s": elapsed,
+        "requests": len(samples),
+        "throughput_rps": len(samples) / elapsed,
+        "latency_ms": latency_summary(
+            [latency for _, _, latency in samples]),
+        "latency_ms_by_kind": {
+            kind: latency_summary([
+                latency for sample_kind, _, latency in samples
+                if sample_kind == kind
+            ])
+            for kind in ["valid"] + INVALID_KINDS
+        },
+        "status_counts": statuses,
+        "error_rate": unexpected / len(samples) if samples else None,
+    }
+
+
+def build_mix(sizes, weights, invalid_ratio) -> Tuple[list, list]:
+    # Each size gets its share of the weight, split between its valid
+    # payloads and its invalid ones.
+    payloads: List[Payload] = []
+    payload_weights: List[float] = []
+    total = sum(weights)
+    for size, weight in zip(sizes, weights):
+        share = weight / total
+        valid = valid_payloads(size, 8)
+        invalid = invalid_payloads(size)
+        payloads += valid + invalid
+        payload_weights += [(1 - invalid_ratio) * share / len(valid)] \
+            * len(valid)
+        payload_weights += [invalid_ratio * share / len(invalid)] \
+            * len(invalid)
+    return payloads, payload_weights
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+",
+                        default=[3, 100, 1000])
+    parser.add_argument("--weights", type=float, nargs="+")
+    parser.add_argument("--invalid-ratio", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, nargs="+",
+                        default=[1, 4, 16])
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    weights = args.weights or [1] * len(args.sizes)
+    if len(weights) != len(args.sizes):
+        parser.error("--weights must have as many values as --sizes")
+    payloads, payload_weights = build_mix(
+        args.sizes, weights, args.invalid_ratio)
+
+    server = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "--factory",
+            "api.fastapi.main:create_app", "--port", str(args.port),
+            "--log-level", "warning",
+        ],
+        env=dict(os.environ),
+    )
+    try:
+        wait_for_port(args.port, timeout=30)
+        levels = [
+            run_level(
+                args.port, payloads, payload_weights, concurrency,
+                args.duration,
+            )
+            for concurrency in args.concurrency
+        ]
+    finally:
+        server.terminate()
+        server.wait()
+
+    report = {
+        "config": {
+            "sizes": args.sizes,
+            "weights": weights,
+            "invalid_ratio": args.invalid_ratio,
+            "duration_s": args.duration,
+            "geometry_workers": int(os.getenv("GEOMETRY_WORKERS", "1")),
+        },
+        "levels": levels,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+import math
+import random
+from typing import Callable, Dict, Iterator, Tuple
+
+from domain.geometry.dto import PlaneDTO, PointDTO, PolygonDTO
+
+
+def regular_polygon(
+    count: int,
+    radius: float = 1,
+    center: Tuple[float, float] = (0, 0),
+) -> PolygonDTO:
+    return PolygonDTO(
+        vertices=[
+            PointDTO(
+                x=center[0] + radius * math.cos(2 * math.pi * i / count),
+                y=center[1] + radius * math.sin(2 * math.pi * i / count),
+                z=0,
+            )
+            for i in range(count)
+        ]
+    )
+
+
+def random_convex_polygon(
+    count: int,
+    radius: float = 1,
+    center: Tuple[float, float] = (0, 0),
+    seed: int = 0,
+) -> PolygonDTO:
+    # Vertices at random angles on an ellipse are always in convex position.
+    rng = random.Random(seed)
+    angles = sorted(rng.uniform(0, 2 * math.pi) for _ in range(count))
+    ratio = rng.uniform(0.25, 1)
+    return PolygonDTO(
+        vertices=[
+            PointDTO(
+                x=center[0] + radius * math.cos(angle),
+                y=center[1] + ratio * radius * math.sin(angle),
+                z=0,
+            )
+            for angle in angles
+        ]
+    )
+
+
+def random_cutting_planes(
+    polygon: PolygonDTO,
+    count: int,
+    seed: int = 0,
+) -> Iterator[PlaneDTO]:
+    # Planes orthogonal to the XY plane at random angles, passing through
+    # random points between the centroid of the vertices and one of the
+    # vertices. Such points lie inside a convex polygon, so every plane
+    # cuts it.
+    rng = random.Random(seed)
+    vertices = polygon.vertices
+    cx = sum(vertex.x for vertex in vertices) / len(vertices)
+    cy = sum(vertex.y for vertex in vertices) / len(vertices)
+    for _ in range(count):
+        vertex = rng.choice(vertices)
+        ratio = rng.uniform(0, 0.9)
+        x = cx + ratio * (vertex.x - cx)
+        y = cy + ratio * (vertex.y - cy)
+        angle = rng.uniform(0, math.pi)
+        yield PlaneDTO(
+            p1=PointDTO(x=x, y=y, z=0),
+            p2=PointDTO(x=x, y=y, z=1),
+            p3=PointDTO(x=x + math.cos(angle), y=y + math.sin(angle), z=0),
+        )
+
+
+GENERATORS: Dict[str, Callable[..., PolygonDTO]] = {
+    "regular": regular_polygon,
+    "random_convex": random_convex_polygon,
+}
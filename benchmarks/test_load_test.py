@@ -0,0 +1,47 @@
+import json
+import unittest
+
+from apps.geometry.usecase import UseCase as GeometryUseCase
+from benchmarks import load_test
+from domain.geometry import errors
+from domain.geometry.dto import PlaneDTO, PolygonDTO
+
+
+class TestLoadTest(unittest.IsolatedAsyncioTestCase):
+
+    async def test_invalid_payloads_raise_their_error(self):
+        usecase = GeometryUseCase()
+        expected_errors = {
+            "not_on_xy_plane": errors.ErrPolygonNotOnXYPlane,
+            "not_convex": errors.ErrPolygonNotConvex,
+            "not_orthogonal": errors.ErrPlaneNotOrthogonalToPolygon,
+            "no_intersection": errors.ErrPlaneDoesNotIntersectPolygon,
+        }
+
+        for size in (3, 4, 5, 6, 7, 8, 100, 1000):
+            payloads = load_test.invalid_payloads(size)
+            self.assertEqual(
+                [kind for kind, _ in payloads], load_test.INVALID_KINDS)
+
+            for kind, body in payloads:
+                body = json.loads(body)
+                with self.assertRaises(
+                    expected_errors[kind], msg=(kind, size)
+                ):
+                    await usecase.cut_polygon_at_plane(
+                        PolygonDTO.parse_obj(body["polygon"]),
+                        PlaneDTO.parse_obj(body["plane"]),
+                    )
+
+    async def test_valid_payloads_are_cut(self):
+        usecase = GeometryUseCase()
+
+        for size in (3, 100):
+            for kind, body in load_test.valid_payloads(size, 8):
+                body = json.loads(body)
+                result = await usecase.cut_polygon_at_plane(
+                    PolygonDTO.parse_obj(body["polygon"]),
+                    PlaneDTO.parse_obj(body["plane"]),
+                )
+                self.assertEqual(kind, "valid")
+                self.assertTrue(result)
@@ -1,9 +1,15 @@
+from enum import Enum
 from typing import List
 from pydantic import BaseModel
 
 from domain.geometry import entity
 
 
+class Precision(str, Enum):
+    FLOAT64 = "float64"
+    FLOAT32 = "float32"
+
+
 class PointDTO(BaseModel):
     x: float
     y: float
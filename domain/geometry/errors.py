@@ -33,3 +33,11 @@ class ErrPlaneDoesNotIntersectPolygon(ErrInvalidPolygon):
         message="Plane does not intersect the polygon."
     ):
         super().__init__(message)
+
+
+class ErrPolygonNotRepresentable(ErrInvalidPolygon):
+    def __init__(
+        self,
+        message="Coordinates must be representable in the requested precision."
+    ):
+        super().__init__(message)
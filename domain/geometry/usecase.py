@@ -11,5 +11,6 @@ class UseCase(ABC):
         self,
         polygon: dto.PolygonDTO,
         plane: dto.PlaneDTO,
+        precision: dto.Precision = dto.Precision.FLOAT64,
     ) -> List[dto.PointDTO]:
         pass